@@ -1,12 +1,19 @@
 """Tone analysis chain using LangChain and Ollama."""
 
-import json
+import hashlib
 import logging
 import os
+import re
+from functools import lru_cache
 from typing import Optional
 
+import orjson
 from langchain_community.llms import Ollama
-from pydantic import BaseModel, Field
+from langchain_core.caches import InMemoryCache
+from langchain_core.globals import set_llm_cache
+from pydantic import BaseModel, Field, ValidationError
+
+from utils.cache import Cache
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +22,91 @@ logger = logging.getLogger(__name__)
 # rest of the application can store/serialize results without additional
 # parsing work.
 
+# Results are only cached for calls at or below this temperature; hotter
+# sampling is meant to vary between calls, so reusing an answer would hide
+# that.
+MAX_CACHEABLE_TEMPERATURE = 0.5
+
+# Every prompt starts with exactly these bytes and only the page text is
+# appended, so the shared prefix stays identical across calls and any
+# server-side prompt/KV caching can reuse it.
+_PROMPT_PREFIX = """You are a concise content analyzer. Analyze the following text for tone and readability.
+
+Provide your response as a JSON object with these exact keys:
+- "readability": Brief assessment (max 2 sentences)
+- "tone": Brief description (max 2 sentences)
+- "risks": Potential issues (max 2 sentences)
+
+Respond with the JSON object only.
+
+Text to analyze:
+"""
+
+# Leading ``` fence (with any language tag, e.g. ```json, ```JSON,
+# ```javascript) and trailing ``` fence around the JSON reply
+_FENCE_RE = re.compile(r"^\s*```[\w-]*\s*|\s*```\s*$")
+
+# Identical prompts within a process are answered from LangChain's global LLM
+# cache instead of calling the model again. Clients above
+# MAX_CACHEABLE_TEMPERATURE opt out of it (see `_get_llm`).
+set_llm_cache(InMemoryCache(maxsize=1024))
+
+
+@lru_cache(maxsize=8)
+def _get_llm(model_name: str, base_url: str, temperature: float) -> Ollama:
+    """Return a shared Ollama client for the given configuration.
+
+    Clients are reused across calls so the wrapper is not rebuilt and
+    re-validated for every page. Clients sampling above
+    MAX_CACHEABLE_TEMPERATURE bypass the global LLM cache so each call
+    gets a fresh reply.
+    """
+    return Ollama(
+        model=model_name,
+        base_url=base_url,
+        temperature=temperature,
+        cache=None if temperature <= MAX_CACHEABLE_TEMPERATURE else False,
+    )
+
+
+def _resolve_model_name(model_name: Optional[str]) -> str:
+    """Return `model_name`, falling back to the OLLAMA_MODEL env var."""
+    if model_name is None:
+        return os.getenv("OLLAMA_MODEL", "llama3.1:8b-instruct")
+    return model_name
+
+
+def _tone_cache_key(text: str, model_name: str) -> str:
+    """Build the response-cache key for an already truncated text."""
+    return hashlib.sha1(f"{model_name}|{text}".encode()).hexdigest()
+
+
+def get_cached_tone(
+    text: str,
+    cache: Optional[Cache],
+    model_name: str = None,
+    max_length: int = 1200
+) -> Optional[dict]:
+    """
+    Look up a previous tone analysis for the same model and text.
+
+    Lets callers reuse results stored by `analyze_tone` without calling
+    the model or spending LLM budget.
+
+    Args:
+        text: Text content to analyze
+        cache: Tone response cache (None disables the lookup)
+        model_name: Ollama model name (defaults to env var)
+        max_length: Maximum text length to analyze
+
+    Returns:
+        Cached analysis dictionary, or None if not cached
+    """
+    if cache is None:
+        return None
+    key = _tone_cache_key(text[:max_length], _resolve_model_name(model_name))
+    return cache.get(key)
+
 
 class ToneAnalysisOutput(BaseModel):
     """Structured output for tone analysis."""
@@ -27,7 +119,9 @@ def analyze_tone(
     text: str,
     model_name: str = None,
     base_url: str = None,
-    max_length: int = 1200
+    max_length: int = 1200,
+    temperature: float = 0.3,
+    cache: Optional[Cache] = None
 ) -> Optional[dict]:
     """
     Analyze tone and readability of text using LLM.
@@ -37,14 +131,17 @@ def analyze_tone(
         model_name: Ollama model name (defaults to env var)
         base_url: Ollama base URL (defaults to env var)
         max_length: Maximum text length to analyze
+        temperature: Sampling temperature for the model
+        cache: Tone response cache; successful analyses are stored there
+            for `get_cached_tone` unless the temperature is above
+            MAX_CACHEABLE_TEMPERATURE.
 
     Returns:
         Dictionary with readability, tone, and risks, or None on error
     """
     try:
         # Get configuration from environment (falls back to a sensible default)
-        if model_name is None:
-            model_name = os.getenv("OLLAMA_MODEL", "llama3.1:8b-instruct")
+        model_name = _resolve_model_name(model_name)
         if base_url is None:
             base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 
@@ -53,26 +150,12 @@ def analyze_tone(
             text = text[:max_length]
             logger.debug(f"Text truncated to {max_length} characters for LLM analysis")
 
-        # Initialize Ollama LLM (LangChain wrapper). We set a low temperature
-        # for deterministic, repeatable outputs suitable for structured JSON.
-        llm = Ollama(
-            model=model_name,
-            base_url=base_url,
-            temperature=0.3,
-        )
-
-        # Construct prompt
-        prompt = f"""You are a concise content analyzer. Analyze the following text for tone and readability.
+        # Get the Ollama LLM (LangChain wrapper). The default temperature is
+        # low for deterministic, repeatable outputs suitable for structured JSON.
+        llm = _get_llm(model_name, base_url, temperature)
 
-Provide your response as a JSON object with these exact keys:
-- "readability": Brief assessment (max 2 sentences)
-- "tone": Brief description (max 2 sentences)
-- "risks": Potential issues (max 2 sentences)
-
-Text to analyze:
-{text}
-
-Response (JSON only):"""
+        # Construct prompt: fixed instructions first, page text last
+        prompt = _PROMPT_PREFIX + text
 
     # Call LLM: send the concise instruction and receive text output.
         logger.debug(f"Calling Ollama model: {model_name}")
@@ -83,30 +166,18 @@ Response (JSON only):"""
             # Try to extract JSON from response. Ollama/LLMs sometimes wrap
             # JSON in markdown code blocks (```json ... ```), so strip those
             # wrappers before attempting to parse.
-            response = response.strip()
-
-            # Handle markdown code blocks
-            if response.startswith("```"):
-                lines = response.split("\n")
-                response = "\n".join(lines[1:-1]) if len(lines) > 2 else response
-                response = response.replace("```json", "").replace("```", "").strip()
-
-            result = json.loads(response)
-
-            # Validate keys
-            required_keys = ["readability", "tone", "risks"]
-            if not all(key in result for key in required_keys):
-                logger.error(f"LLM response missing required keys: {result}")
-                return {
-                    "readability": "Unable to analyze",
-                    "tone": "Unable to analyze",
-                    "risks": "Analysis failed - invalid response format"
-                }
+            response = _FENCE_RE.sub("", response).strip()
+
+            # Validate against the output schema (pydantic-core, in Rust) and
+            # keep only the expected string fields
+            result = ToneAnalysisOutput.model_validate(orjson.loads(response)).model_dump()
 
             logger.debug("Tone analysis completed successfully")
+            if cache is not None and temperature <= MAX_CACHEABLE_TEMPERATURE:
+                cache.set(_tone_cache_key(text, model_name), result)
             return result
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse LLM response as JSON: {e}")
             logger.debug(f"Raw response: {response[:500]}")
             return {
@@ -115,6 +186,14 @@ Response (JSON only):"""
                 "risks": f"Analysis failed - JSON parse error"
             }
 
+        except ValidationError as e:
+            logger.error(f"LLM response does not match the expected format: {e}")
+            return {
+                "readability": "Unable to analyze",
+                "tone": "Unable to analyze",
+                "risks": "Analysis failed - invalid response format"
+            }
+
     except Exception as e:
         logger.error(f"Error in tone analysis: {e}")
         return None
@@ -9,33 +9,41 @@ directory.
 
 High level flow:
     - Load URLs from an input CSV
-    - For each URL: check cache -> fetch HTML -> extract text & metadata
-    - Run rule-based checks (SEO + A11y)
-    - Optionally run LLM tone analysis (budget-controlled)
-    - Save results to JSONL and summary CSV
+    - Serve cached results, then fetch the remaining pages concurrently in
+      windows of --batch-size pages
+    - For each fetched page (in worker processes): extract text & metadata
+      and run rule-based checks (SEO + A11y)
+    - Optionally run LLM tone analysis in a thread pool (budget-controlled)
+    - Stream results to JSONL as pages complete, then write the summary CSV
 """
 
 import csv
-import json
 import logging
 import os
 import time
+from collections import Counter
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from pathlib import Path
 from typing import List, Optional
 
+import orjson
 import typer
 from dotenv import load_dotenv
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 
-from chains.tone_chain import analyze_tone
+from chains.tone_chain import analyze_tone, get_cached_tone
 from rules.a11y_rules import check_a11y
 from rules.seo_rules import check_seo
 from utils.budget import BudgetManager
 from utils.cache import Cache
-from utils.html_fetch import fetch_page
-from utils.html_to_text import extract_metadata, extract_text
+from utils.html_fetch import fetch_page, fetch_pages
+from utils.html_to_text import ParsedPage, extract_metadata, extract_text
 
 # Load environment variables
 load_dotenv()
@@ -51,6 +59,9 @@ logger = logging.getLogger(__name__)
 app = typer.Typer(help="AI Content Auditor for SEO, accessibility, and tone analysis")
 console = Console()
 
+# Accepted URL column names in the input CSV, in order of preference
+URL_COLUMNS = ('url', 'URL', 'Url', 'link')
+
 
 def load_urls_from_csv(csv_path: str) -> List[str]:
     """Load URLs from CSV file.
@@ -61,10 +72,13 @@ def load_urls_from_csv(csv_path: str) -> List[str]:
     urls = []
     try:
         with open(csv_path, 'r') as f:
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
+            header = next(reader, [])
+            # Resolve the URL columns once, in order of preference, so each
+            # row is a plain index lookup rather than a dict build.
+            columns = [header.index(name) for name in URL_COLUMNS if name in header]
             for row in reader:
-                # Try common column names
-                url = row.get('url') or row.get('URL') or row.get('Url') or row.get('link')
+                url = next((row[i] for i in columns if i < len(row) and row[i]), None)
                 if url:
                     urls.append(url.strip())
         logger.info(f"Loaded {len(urls)} URLs from {csv_path}")
@@ -74,34 +88,18 @@ def load_urls_from_csv(csv_path: str) -> List[str]:
     return urls
 
 
-def process_page(
-    url: str,
-    cache: Cache,
-    budget: BudgetManager,
-    use_llm: bool = True
-) -> dict:
-    """Process a single page.
+def run_rule_checks(url: str, html: Optional[str]) -> dict:
+    """Run the CPU-bound part of the pipeline for one page.
 
-    Steps performed:
-      1. Return cached result if available.
-      2. Fetch the page HTML synchronously.
-      3. Extract main article text using readability + BeautifulSoup.
-      4. Run zero-cost rule checks (SEO + A11y).
-      5. Optionally run an LLM-based tone analysis (if budget allows).
-      6. Assemble result dict and persist to disk cache.
-
-    The returned dict is serializable to JSON and stored in the JSONL report.
-    """
-    logger.info(f"Processing: {url}")
+    Extracts the main article text (readability + BeautifulSoup) and runs
+    the zero-cost rule checks (SEO + A11y) on a single shared parse. It is
+    a pure function of its arguments, so `audit` runs it in worker
+    processes.
 
-    # Check cache first
-    cached = cache.get(url)
-    if cached:
-        logger.info(f"Using cached result for {url}")
-        return cached
-
-    # Fetch HTML
-    html = fetch_page(url)
+    Returns an error result for a falsy `html` (failed fetch) or when no
+    text can be extracted; otherwise a dict with the extracted `text` and
+    the `seo_rules` / `a11y_rules` results.
+    """
     if not html:
         return {
             "url": url,
@@ -111,8 +109,9 @@ def process_page(
             "tone_summary": None
         }
 
-    # Extract text and metadata
-    text = extract_text(html)
+    # Parse once; text extraction and rule checks share the page
+    page = ParsedPage.from_html(html)
+    text = extract_text(page)
     if not text:
         return {
             "url": url,
@@ -122,17 +121,51 @@ def process_page(
             "tone_summary": None
         }
 
-    # Run rule-based checks
-    seo_results = check_seo(html, text)
-    a11y_results = check_a11y(html, text)
+    # Run rule-based checks on the shared full-document tree
+    return {
+        "url": url,
+        "text": text,
+        "seo_rules": check_seo(page.soup_full, text),
+        "a11y_rules": check_a11y(page.soup_full, text),
+    }
+
+
+def finish_page(
+    checks: dict,
+    cache: Cache,
+    budget: BudgetManager,
+    use_llm: bool = True,
+    tone_cache: Optional[Cache] = None
+) -> dict:
+    """Complete a page from the output of `run_rule_checks`.
+
+    Steps performed:
+      1. Optionally run an LLM-based tone analysis. Results for identical
+         text are reused from `tone_cache` without spending budget; new
+         analyses run only if a call can be reserved from the budget, and
+         the call is refunded if the analysis fails.
+      2. Assemble result dict and persist to disk cache.
+
+    Error results are passed through uncached. The returned dict is
+    serializable to JSON and stored in the JSONL report.
+    """
+    if "error" in checks:
+        return checks
+
+    url = checks["url"]
+    text = checks["text"]
+    seo_results = checks["seo_rules"]
+    a11y_results = checks["a11y_rules"]
 
     # Optionally run LLM tone analysis
     tone_summary = None
-    if use_llm and budget.can_make_call("tone_analysis"):
-        logger.info(f"Running tone analysis for {url}")
-        tone_summary = analyze_tone(text)
-        if tone_summary:
-            budget.record_call("tone_analysis")
+    if use_llm:
+        tone_summary = get_cached_tone(text, tone_cache)
+        if tone_summary is None and budget.try_consume("tone_analysis"):
+            logger.info(f"Running tone analysis for {url}")
+            tone_summary = analyze_tone(text, cache=tone_cache)
+            if not tone_summary:
+                budget.refund("tone_analysis")
 
     # Compile results
     result = {
@@ -153,11 +186,87 @@ def process_page(
     return result
 
 
+def analyze_page(
+    url: str,
+    html: Optional[str],
+    cache: Cache,
+    budget: BudgetManager,
+    use_llm: bool = True,
+    tone_cache: Optional[Cache] = None
+) -> dict:
+    """Analyze already-fetched HTML for a single page in this process.
+
+    Runs `run_rule_checks` followed by `finish_page`.
+    """
+    checks = run_rule_checks(url, html)
+    return finish_page(checks, cache, budget, use_llm=use_llm, tone_cache=tone_cache)
+
+
+def process_page(
+    url: str,
+    cache: Cache,
+    budget: BudgetManager,
+    use_llm: bool = True,
+    tone_cache: Optional[Cache] = None
+) -> dict:
+    """Process a single page.
+
+    Returns the cached result if available; otherwise fetches the page HTML
+    synchronously and hands it to `analyze_page`.
+    """
+    logger.info(f"Processing: {url}")
+
+    # Check cache first
+    cached = cache.get(url)
+    if cached:
+        logger.info(f"Using cached result for {url}")
+        return cached
+
+    html = fetch_page(url)
+    return analyze_page(url, html, cache, budget, use_llm=use_llm, tone_cache=tone_cache)
+
+
+def _summary_row(result: dict) -> tuple:
+    """Reduce a page result to its summary.csv fields.
+
+    Returns (url, seo_score, a11y_score, issues_count, has_tone). Error
+    results carry no scores or issues and are reported as zeros.
+    """
+    scores = result.get("scores", {})
+    return (
+        result["url"],
+        scores.get("seo", 0),
+        scores.get("a11y", 0),
+        len(result.get("issues", [])),
+        bool(result.get("tone_summary")),
+    )
+
+
+def _finish_page_task(
+    url: str,
+    checks: Future,
+    cache: Cache,
+    budget: BudgetManager,
+    use_llm: bool = True,
+    tone_cache: Optional[Cache] = None
+) -> dict:
+    """Thread-pool entrypoint that completes a page once its checks are done.
+
+    `checks` is the pending `run_rule_checks` future from the process pool.
+    The page is already fetched and checked by then, so it is always saved;
+    once the LLM budget is exhausted `finish_page` just skips its tone step.
+    """
+    logger.info(f"Processing: {url}")
+    return finish_page(checks.result(), cache, budget, use_llm=use_llm, tone_cache=tone_cache)
+
+
 @app.command()
 def audit(
     input_csv: str = typer.Option(..., "--input", "-i", help="Path to CSV file with URLs"),
     max_pages: int = typer.Option(200, "--max-pages", help="Maximum pages to process"),
-    batch_size: int = typer.Option(20, "--batch-size", help="Pages per batch"),
+    batch_size: int = typer.Option(
+        20, "--batch-size", min=1, help="Maximum pages processed concurrently"
+    ),
     no_llm: bool = typer.Option(False, "--no-llm", help="Disable LLM tone analysis"),
     max_llm_calls: int = typer.Option(200, "--max-calls", help="Maximum LLM calls"),
     cache_dir: str = typer.Option(".cache", "--cache-dir", help="Cache directory"),
@@ -171,10 +280,12 @@ def audit(
 
     # Initialize components
     cache = Cache(cache_dir)
+    tone_cache = Cache(str(Path(cache_dir) / "tone"))
     budget = BudgetManager(max_calls=max_llm_calls)
 
     if clear_cache:
         cache.clear()
+        tone_cache.clear()
         console.print("[yellow]Cache cleared[/yellow]")
 
     # Load URLs
@@ -190,38 +301,80 @@ def audit(
     if no_llm:
         console.print("[yellow]LLM tone analysis disabled[/yellow]")
 
-    # Process pages
-    results = []
+    # Results are streamed to the JSONL report in input order, window by
+    # window, so only a small summary row per page is kept in memory and a
+    # crashed run still leaves the finished pages on disk.
+    reports_path = Path(reports_dir)
+    reports_path.mkdir(parents=True, exist_ok=True)
+    jsonl_path = reports_path / "pages.jsonl"
+
+    summary_rows = []
+    issue_counts = Counter()
     start_time = time.time()
 
-    with Progress(
+    def save_result(result: dict):
+        jsonl_file.write(orjson.dumps(result) + b"\n")
+        jsonl_file.flush()
+        summary_rows.append(_summary_row(result))
+        issue_counts.update(result.get("issues", []))
+
+    # Process pages in windows of --batch-size: cached results are used
+    # as-is, the rest of the window is fetched and analyzed concurrently, and
+    # the window is then saved in input order. Only one window of HTML and
+    # pending results is held in memory at a time.
+    with open(jsonl_path, 'wb') as jsonl_file, Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         console=console
     ) as progress:
-        task = progress.add_task("Processing pages...", total=len(urls))
-
-        for i, url in enumerate(urls, 1):
-            result = process_page(url, cache, budget, use_llm=not no_llm)
-            results.append(result)
-            progress.update(task, advance=1, description=f"Processed {i}/{len(urls)}")
-
-            # Stop if budget exhausted
-            if not no_llm and not budget.can_make_call():
-                console.print("\n[yellow]Budget limit reached, stopping early[/yellow]")
-                break
+        task = progress.add_task(f"Processed 0/{len(urls)}", total=len(urls))
+
+        # Text extraction and rule checks are CPU-bound, so they run in worker
+        # processes; tone analysis and caching stay on threads here.
+        with (
+            ProcessPoolExecutor(max_workers=os.cpu_count()) as cpu_pool,
+            ThreadPoolExecutor(max_workers=batch_size) as executor,
+        ):
+            for start in range(0, len(urls), batch_size):
+                window = urls[start:start + batch_size]
+
+                # A URL listed more than once in the window is looked up,
+                # fetched and analyzed once, then saved for each occurrence.
+                results = {}
+                for url in window:
+                    if url not in results:
+                        results[url] = cache.get(url)
+                        if results[url]:
+                            logger.info(f"Using cached result for {url}")
+                pending_urls = [url for url, cached in results.items() if not cached]
+
+                htmls = fetch_pages(pending_urls, concurrency=batch_size)
+                futures = {
+                    url: executor.submit(
+                        _finish_page_task,
+                        url,
+                        cpu_pool.submit(run_rule_checks, url, htmls.pop(url)),
+                        cache,
+                        budget,
+                        not no_llm,
+                        tone_cache,
+                    )
+                    for url in pending_urls
+                }
+                for url in window:
+                    if not results[url]:
+                        results[url] = futures.pop(url).result()
+                    save_result(results[url])
+                    progress.update(
+                        task, advance=1, description=f"Processed {len(summary_rows)}/{len(urls)}"
+                    )
+
+    if not no_llm and budget.calls_made >= budget.max_calls:
+        console.print(
+            "\n[yellow]Budget limit reached, later pages saved without tone analysis[/yellow]"
+        )
 
     elapsed_time = time.time() - start_time
-
-    # Save results
-    reports_path = Path(reports_dir)
-    reports_path.mkdir(parents=True, exist_ok=True)
-
-    # Save JSONL (detailed per-page results)
-    jsonl_path = reports_path / "pages.jsonl"
-    with open(jsonl_path, 'w') as f:
-        for result in results:
-            f.write(json.dumps(result) + "\n")
     console.print(f"\n[green]Saved detailed results to {jsonl_path}[/green]")
 
     # Save CSV summary
@@ -229,14 +382,16 @@ def audit(
     with open(csv_path, 'w', newline='') as f:
         writer = csv.writer(f)
         writer.writerow(["URL", "SEO Score", "A11y Score", "Issues Count", "Has Tone Analysis"])
-        for result in results:
-            writer.writerow([
-                result["url"],
-                f"{result['scores']['seo']:.1f}",
-                f"{result['scores']['a11y']:.1f}",
-                len(result["issues"]),
-                "Yes" if result.get("tone_summary") else "No"
-            ])
+        writer.writerows(
+            [
+                url,
+                f"{seo_score:.1f}",
+                f"{a11y_score:.1f}",
+                issues_count,
+                "Yes" if has_tone else "No"
+            ]
+            for url, seo_score, a11y_score, issues_count, has_tone in summary_rows
+        )
     console.print(f"[green]Saved summary to {csv_path}[/green]")
 
     # Display statistics
@@ -245,9 +400,12 @@ def audit(
     stats_table.add_column("Metric", style="cyan")
     stats_table.add_column("Value", style="green")
 
-    stats_table.add_row("Pages Processed", str(len(results)))
+    pages_processed = len(summary_rows)
+    stats_table.add_row("Pages Processed", str(pages_processed))
     stats_table.add_row("Time Elapsed", f"{elapsed_time:.1f}s")
-    stats_table.add_row("Avg Time per Page", f"{elapsed_time/len(results):.1f}s")
+    stats_table.add_row(
+        "Avg Time per Page", f"{elapsed_time/pages_processed if pages_processed else 0:.1f}s"
+    )
 
     if not no_llm:
         budget_stats = budget.get_stats()
@@ -261,15 +419,9 @@ def audit(
     console.print(stats_table)
 
     # Top issues summary
-    all_issues = []
-    for result in results:
-        all_issues.extend(result["issues"])
-
-    if all_issues:
+    if issue_counts:
         console.print("\n[bold]Top Issues:[/bold]")
-        from collections import Counter
-        issue_counts = Counter(all_issues).most_common(10)
-        for issue, count in issue_counts:
+        for issue, count in issue_counts.most_common(10):
             console.print(f"  • {issue} ({count} pages)")
 
     console.print("\n[bold green]Audit complete![/bold green]\n")
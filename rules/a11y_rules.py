@@ -1,17 +1,37 @@
 """Accessibility rule-based checks."""
 
 import logging
+import re
+from bisect import bisect_right
+from typing import Union
+
 from bs4 import BeautifulSoup
 
+from utils.html_to_text import soup_for
+
 logger = logging.getLogger(__name__)
 
+HEADING_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+GENERIC_LINK_TEXT = frozenset({'click here', 'read more', 'here', 'more', 'link'})
+
+# Alt-text coverage bands: bisect_right(_ALT_BOUNDS, percentage) indexes _ALT_SCORES
+_ALT_BOUNDS = (50, 80, 100)
+_ALT_SCORES = (25, 50, 75, 100)
+
+# Opening tags the accessibility checks read, for `soup_for`
+_A11Y_TAG_RE = re.compile(r"<(?:img|h[1-6]|a)\b", re.IGNORECASE)
+
 
-def check_a11y(html: str, text: str) -> dict:
-    """Run all accessibility rule checks on HTML content."""
+def check_a11y(html: Union[str, BeautifulSoup], text: str) -> dict:
+    """Run all accessibility rule checks on HTML content.
+
+    `html` may be raw markup or a shared soup (see `soup_for`); markup
+    without any img/heading/a tags is checked as an empty document.
+    """
     results = {"scores": {}, "issues": [], "metrics": {}}
     
     try:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = soup_for(html, _A11Y_TAG_RE)
         
         # Check image alt attributes
         img_result = check_image_alts(soup)
@@ -54,28 +74,12 @@ def check_image_alts(soup: BeautifulSoup) -> dict:
         result["score"] = 100
         return result
     
-    for img in images:
-        if img.get('alt') is not None:
-            result["with_alt"] += 1
+    result["with_alt"] = sum(1 for img in images if img.get('alt') is not None)
     
     alt_percentage = (result["with_alt"] / result["total"]) * 100 if result["total"] > 0 else 0
     
-    if alt_percentage == 100:
-        result["score"] = 100
-    elif alt_percentage >= 80:
-        result["score"] = 75
-        result["issues"].append(
-            f"{result['total'] - result['with_alt']} images missing alt text "
-            f"({alt_percentage:.1f}% have alt)"
-        )
-    elif alt_percentage >= 50:
-        result["score"] = 50
-        result["issues"].append(
-            f"{result['total'] - result['with_alt']} images missing alt text "
-            f"({alt_percentage:.1f}% have alt)"
-        )
-    else:
-        result["score"] = 25
+    result["score"] = _ALT_SCORES[bisect_right(_ALT_BOUNDS, alt_percentage)]
+    if result["score"] < 100:
         result["issues"].append(
             f"{result['total'] - result['with_alt']} images missing alt text "
             f"({alt_percentage:.1f}% have alt)"
@@ -88,10 +92,8 @@ def check_heading_hierarchy(soup: BeautifulSoup) -> dict:
     """Check heading hierarchy order."""
     result = {"score": 100, "issues": []}
     
-    headings = []
-    for level in range(1, 7):
-        for heading in soup.find_all(f'h{level}'):
-            headings.append(level)
+    # One traversal in document order; the level is the digit in the tag name
+    headings = [int(heading.name[1]) for heading in soup.find_all(HEADING_TAGS)]
     
     if not headings:
         result["score"] = 50
@@ -121,15 +123,9 @@ def check_link_text(soup: BeautifulSoup) -> dict:
         result["score"] = 100
         return result
     
-    generic_phrases = ['click here', 'read more', 'here', 'more', 'link']
-    generic_count = 0
-    
-    for link in links:
-        text = link.get_text(strip=True).lower()
-        if text:
-            result["with_text"] += 1
-            if text in generic_phrases:
-                generic_count += 1
+    texts = [link.get_text(strip=True).lower() for link in links]
+    result["with_text"] = sum(1 for text in texts if text)
+    generic_count = sum(1 for text in texts if text in GENERIC_LINK_TEXT)
     
     text_percentage = (result["with_text"] / result["total"]) * 100 if result["total"] > 0 else 0
     
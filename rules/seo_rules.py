@@ -1,17 +1,53 @@
 """SEO rule-based checks."""
 
 import logging
+import re
+from bisect import bisect_right
+from typing import Union
+
 from bs4 import BeautifulSoup
 
+from utils.html_to_text import soup_for
+
 logger = logging.getLogger(__name__)
 
+# Score bands: bisect_right(BOUNDS, value) picks the index into SCORES and
+# ISSUES (None means no issue for that band).
+_TITLE_BOUNDS = (1, 30, 61)
+_TITLE_SCORES = (0, 50, 100, 75)
+_TITLE_ISSUES = (
+    "Empty title tag",
+    "Title too short ({length} chars, recommended 30-60)",
+    None,
+    "Title too long ({length} chars, recommended 30-60)",
+)
+
+_META_DESC_BOUNDS = (1, 120, 161)
+_META_DESC_SCORES = (0, 50, 100, 75)
+_META_DESC_ISSUES = (
+    "Empty meta description",
+    "Meta description too short ({length} chars, recommended 120-160)",
+    None,
+    "Meta description too long ({length} chars, recommended 120-160)",
+)
+
+_WORD_COUNT_BOUNDS = (300, 600)
+_WORD_COUNT_SCORES = (25, 75, 100)
 
-def check_seo(html: str, text: str) -> dict:
-    """Run all SEO rule checks on HTML content."""
+# Opening tags the SEO checks read, for `soup_for`
+_SEO_TAG_RE = re.compile(r"<(?:title|meta|h1|link)\b", re.IGNORECASE)
+
+
+def check_seo(html: Union[str, BeautifulSoup], text: str) -> dict:
+    """Run all SEO rule checks on HTML content.
+
+    `html` may be raw markup or a shared soup (see `soup_for`); markup
+    without any title/meta/h1/link tags is checked as an empty document.
+    """
     results = {"scores": {}, "issues": [], "metrics": {}}
     
     try:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = soup_for(html, _SEO_TAG_RE)
         
         # Check title tag
         title_result = check_title_tag(soup)
@@ -65,16 +101,10 @@ def check_title_tag(soup: BeautifulSoup) -> dict:
     title_text = title_tag.get_text(strip=True)
     result["length"] = len(title_text)
     
-    if result["length"] == 0:
-        result["issues"].append("Empty title tag")
-    elif result["length"] < 30:
-        result["score"] = 50
-        result["issues"].append(f"Title too short ({result['length']} chars, recommended 30-60)")
-    elif result["length"] > 60:
-        result["score"] = 75
-        result["issues"].append(f"Title too long ({result['length']} chars, recommended 30-60)")
-    else:
-        result["score"] = 100
+    band = bisect_right(_TITLE_BOUNDS, result["length"])
+    result["score"] = _TITLE_SCORES[band]
+    if _TITLE_ISSUES[band]:
+        result["issues"].append(_TITLE_ISSUES[band].format(length=result["length"]))
     
     return result
 
@@ -91,16 +121,10 @@ def check_meta_description(soup: BeautifulSoup) -> dict:
     desc_text = meta_desc['content']
     result["length"] = len(desc_text)
     
-    if result["length"] == 0:
-        result["issues"].append("Empty meta description")
-    elif result["length"] < 120:
-        result["score"] = 50
-        result["issues"].append(f"Meta description too short ({result['length']} chars, recommended 120-160)")
-    elif result["length"] > 160:
-        result["score"] = 75
-        result["issues"].append(f"Meta description too long ({result['length']} chars, recommended 120-160)")
-    else:
-        result["score"] = 100
+    band = bisect_right(_META_DESC_BOUNDS, result["length"])
+    result["score"] = _META_DESC_SCORES[band]
+    if _META_DESC_ISSUES[band]:
+        result["issues"].append(_META_DESC_ISSUES[band].format(length=result["length"]))
     
     return result
 
@@ -143,12 +167,8 @@ def check_word_count(text: str) -> dict:
     words = text.split()
     result["count"] = len(words)
     
-    if result["count"] < 300:
-        result["score"] = 25
+    result["score"] = _WORD_COUNT_SCORES[bisect_right(_WORD_COUNT_BOUNDS, result["count"])]
+    if result["count"] < _WORD_COUNT_BOUNDS[0]:
         result["issues"].append(f"Low word count ({result['count']}, recommended 300+)")
-    elif result["count"] < 600:
-        result["score"] = 75
-    else:
-        result["score"] = 100
     
     return result
@@ -0,0 +1,76 @@
+"""Tests for LLM budget accounting."""
+
+import sys
+import os
+import threading
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.budget import BudgetManager
+
+
+def test_try_consume():
+    """Test calls are reserved until the budget runs out."""
+    print("\nTesting try_consume...")
+
+    budget = BudgetManager(max_calls=2)
+
+    assert budget.try_consume("tone_analysis")
+    assert budget.try_consume("tone_analysis")
+    assert not budget.try_consume("tone_analysis")
+    assert budget.get_stats()["total_calls"] == 2
+    assert budget.get_stats()["calls_by_type"] == {"tone_analysis": 2}
+    print("  ✓ Reservations stop at max_calls")
+
+    budget.refund("tone_analysis")
+    assert budget.can_make_call()
+    assert budget.get_stats()["calls_by_type"] == {"tone_analysis": 1}
+    print("  ✓ Refund returns a call to the budget")
+
+    view = budget.get_stats()["calls_by_type"]
+    snapshot = budget.get_stats(deep=True)["calls_by_type"]
+    budget.reset()
+    assert view == {}
+    assert snapshot == {"tone_analysis": 1}
+    print("  ✓ Stats view is live; deep stats are a snapshot")
+
+
+def test_try_consume_concurrent():
+    """Test concurrent reservations never exceed the budget."""
+    print("\nTesting concurrent try_consume...")
+
+    budget = BudgetManager(max_calls=50)
+    granted = []
+
+    def worker():
+        for _ in range(20):
+            if budget.try_consume():
+                granted.append(1)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(granted) == 50
+    assert budget.get_stats()["total_calls"] == 50
+    print("  ✓ Exactly max_calls reservations granted")
+
+
+if __name__ == "__main__":
+    print("Running budget tests...\n")
+
+    try:
+        test_try_consume()
+        test_try_consume_concurrent()
+        print("\n✅ All budget tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
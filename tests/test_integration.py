@@ -1,14 +1,32 @@
 """Integration tests for caching and fetching."""
 
+import asyncio
+import contextlib
+import gc
 import sys
 import os
+import tempfile
+import threading
 import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import orjson
+from typer.testing import CliRunner
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from main import app
 from utils.cache import Cache
-from utils.html_fetch import fetch_page
-from utils.html_to_text import extract_text, extract_metadata
+from utils import html_fetch
+from utils.html_fetch import fetch_and_parse, fetch_page, fetch_page_async, fetch_pages
+from utils.html_to_text import (
+    ParsedPage,
+    _readability_summary,
+    extract_metadata,
+    extract_text,
+    parse_html,
+)
 
 
 def test_cache():
@@ -34,15 +52,202 @@ def test_cache():
     assert stats["total_entries"] >= 1
     print(f"  ✓ Cache stats: {stats['total_entries']} entries")
     
-    # Cleanup
+    # Cleanup, including an entry file left by the old one-file-per-key layout
+    legacy_file = cache.cache_dir / f"{cache._get_hash('old_url')}.json"
+    legacy_file.write_bytes(orjson.dumps(test_data))
     cache.clear()
     stats = cache.get_stats()
     assert stats["total_entries"] == 0
+    assert not legacy_file.exists()
     print("  ✓ Cache clear works")
     
     return True
 
 
+def test_cache_memory_layer():
+    """Test hot entries are served from memory without touching disk."""
+    print("\nTesting in-memory cache layer...")
+
+    cache = Cache(".cache_test")
+    cache.clear()
+
+    test_data = {"foo": "bar"}
+    cache.set("hot_url", test_data)
+
+    # Remove the row behind the cache's back; the memory copy still serves it
+    cache._conn.execute("DELETE FROM cache")
+    assert cache.get("hot_url") == test_data
+    print("  ✓ Hot entry served from memory")
+
+    # A fresh instance only has the (now missing) stored copy
+    assert Cache(".cache_test").get("hot_url") is None
+    print("  ✓ Memory layer is per instance")
+
+    cache.clear()
+    assert cache.get("hot_url") is None
+    print("  ✓ Clear drops memory entries")
+
+
+def test_cache_memory_eviction():
+    """Test the in-memory layer evicts the least recently used entry."""
+    print("\nTesting in-memory cache eviction...")
+
+    cache = Cache(".cache_test", max_entries=2)
+    cache.clear()
+
+    cache.set("url_a", {"page": "a"})
+    cache.set("url_b", {"page": "b"})
+    cache.get("url_a")
+    cache.set("url_c", {"page": "c"})
+
+    assert list(cache._mem) == ["url_a", "url_c"]
+    print("  ✓ Least recently used entry evicted")
+
+    # Evicted entries are still read back from the database
+    assert cache.get("url_b") == {"page": "b"}
+    assert list(cache._mem) == ["url_c", "url_b"]
+    print("  ✓ Evicted entry reloaded from the database")
+
+    cache.clear()
+
+
+def test_cache_compression():
+    """Test entries are stored compressed and uncompressed rows still load."""
+    print("\nTesting cache compression...")
+
+    cache = Cache(".cache_test")
+    cache.clear()
+
+    test_data = {"text": "repeated content " * 100}
+    cache.set("big_url", test_data)
+    (blob,) = cache._conn.execute("SELECT v FROM cache").fetchone()
+    assert blob[:4] == b"\x28\xb5\x2f\xfd"
+    assert len(blob) < len(orjson.dumps(test_data))
+    assert Cache(".cache_test").get("big_url") == test_data
+    print("  ✓ Entry stored as a zstd frame")
+
+    cache._conn.execute(
+        "INSERT INTO cache (k, v, ts) VALUES (?, ?, 0)",
+        (cache._get_hash("plain_url"), orjson.dumps({"plain": True})),
+    )
+    assert cache.get("plain_url") == {"plain": True}
+    print("  ✓ Uncompressed entry still readable")
+
+    cache.clear()
+
+
+def test_parse_html_memoized():
+    """Test repeated parses of the same markup share one tree."""
+    print("\nTesting parse memoization...")
+
+    html = "<html><head><title>Memo</title></head><body><h1>Hi</h1></body></html>"
+
+    soup = parse_html(html)
+    assert parse_html(html) is soup
+    print("  ✓ Same markup returns the cached tree")
+
+    assert parse_html(html.replace("Hi", "Bye")) is not soup
+    print("  ✓ Different markup is parsed separately")
+
+
+def test_readability_summary_memoized():
+    """Test repeated extractions of the same markup reuse the summary."""
+    print("\nTesting memoized readability summary...")
+
+    html = "<html><body><article><p>" + " ".join(["summary"] * 100) + "</p></article></body></html>"
+
+    _readability_summary.cache_clear()
+    summary = _readability_summary(html)
+    assert _readability_summary(html) is summary
+    assert extract_text(html) == extract_text(html)
+    print("  ✓ Same markup returns the cached summary")
+
+
+def test_parsed_page():
+    """Test a ParsedPage gives the same text and metadata as raw HTML."""
+    print("\nTesting shared ParsedPage...")
+
+    html = """
+    <html>
+    <head>
+        <title>Parsed page title</title>
+        <meta name="description" content="Parsed page description">
+        <link rel="canonical" href="https://example.com/parsed">
+    </head>
+    <body>
+        <h1>Main Heading</h1>
+        <article><p>""" + " ".join(["content"] * 200) + """</p></article>
+    </body>
+    </html>
+    """
+
+    page = ParsedPage.from_html(html)
+
+    assert extract_text(page) == extract_text(html)
+    assert extract_text(page, max_length=50) == extract_text(html, max_length=50)
+    print("  ✓ Text matches raw extraction")
+
+    assert extract_metadata(page) == extract_metadata(html)
+    print("  ✓ Metadata matches raw extraction")
+
+
+def test_extract_text_html_cap():
+    """Test oversized HTML is cut at a block boundary before parsing."""
+    print("\nTesting HTML size cap...")
+
+    first = "<p>" + " ".join(["first"] * 100) + "</p>"
+    second = "<p>" + " ".join(["second"] * 100) + "</p>"
+    html = "<html><body><article>" + first + second + "</article></body></html>"
+
+    capped = extract_text(html, max_html_bytes=html.index(second) + 20)
+    assert "first" in capped
+    assert "second" not in capped
+    print("  ✓ Input truncated at the last paragraph within the cap")
+
+    assert "second" in extract_text(html)
+    print("  ✓ Input within the default cap is left intact")
+
+
+def test_extract_metadata():
+    """Test metadata fields and heading counts from a single parse."""
+    print("\nTesting metadata extraction...")
+
+    html = """
+    <html>
+    <head>
+        <title> Metadata <b>title</b> </title>
+        <meta name="description" content="Metadata description">
+        <link rel="canonical nofollow" href="https://example.com/meta">
+    </head>
+    <body>
+        <h1>First <em>heading</em></h1>
+        <h2>Section</h2><h2>Section</h2>
+        <h1>Second</h1>
+        <h6>Small</h6>
+    </body>
+    </html>
+    """
+
+    metadata = extract_metadata(html)
+
+    assert metadata["title"] == "Metadata <b>title</b>"
+    assert metadata["meta_description"] == "Metadata description"
+    assert metadata["canonical_url"] == "https://example.com/meta"
+    assert metadata["h1_tags"] == ["Firstheading", "Second"]
+    assert metadata["headings_count"] == {"h1": 2, "h2": 2, "h3": 0, "h4": 0, "h5": 0, "h6": 1}
+    print("  ✓ Title, description, canonical and headings extracted")
+
+    page = ParsedPage.from_html(html)
+    assert extract_metadata(page) == metadata
+    assert extract_metadata(page) == metadata
+    print("  ✓ ParsedPage gives the same metadata")
+
+    xhtml = '<?xml version="1.0" encoding="utf-8"?>\n' + html.strip()
+    assert extract_metadata(xhtml) == metadata
+    assert extract_metadata(ParsedPage.from_html(xhtml)) == metadata
+    print("  ✓ XML declaration is ignored")
+
+
 def test_fetch_and_extract():
     """Test HTML fetching and extraction."""
     print("\nTesting HTML fetching and extraction...")
@@ -70,6 +275,168 @@ def test_fetch_and_extract():
         return False
 
 
+class _PageHandler(BaseHTTPRequestHandler):
+    """Serves a small page per path under /page/, and 404 for anything else.
+
+    Paths under /slow/ are served after a short delay, and the peak number of
+    them in flight at once is recorded in `peak_slow`.
+    """
+
+    slow_lock = threading.Lock()
+    in_flight_slow = 0
+    peak_slow = 0
+
+    def do_GET(self):
+        if self.path.startswith("/slow/"):
+            cls = type(self)
+            with cls.slow_lock:
+                cls.in_flight_slow += 1
+                cls.peak_slow = max(cls.peak_slow, cls.in_flight_slow)
+            time.sleep(0.05)
+            with cls.slow_lock:
+                cls.in_flight_slow -= 1
+        elif not self.path.startswith("/page/"):
+            self.send_error(404)
+            return
+        name = self.path.rsplit("/", 1)[-1]
+        body = f"<html><head><title>Page {name}</title></head><body><p>{name}</p></body></html>"
+        payload = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def _local_server():
+    """Run `_PageHandler` on a free local port; yields the base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PageHandler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_fetch_and_parse():
+    """Test streaming pages straight into the lxml parser."""
+    print("\nTesting streamed fetch and parse...")
+
+    async def fetch_all(base):
+        urls = [f"{base}/page/{i}" for i in range(10)] + [f"{base}/missing"]
+        return await asyncio.gather(*(fetch_and_parse(url, timeout=10) for url in urls))
+
+    with _local_server() as base:
+        trees = asyncio.run(fetch_all(base))
+
+    titles = [tree.findtext('.//title') for tree in trees[:-1]]
+    assert titles == [f"Page {i}" for i in range(10)]
+    print(f"  ✓ Parsed {len(titles)} streamed pages concurrently")
+
+    assert trees[-1] is None
+    print("  ✓ HTTP error returns None")
+
+
+def test_fetch_pages_limit_per_host():
+    """Test batch fetches cap the requests in flight to one host."""
+    print("\nTesting per-host fetch limit...")
+
+    _PageHandler.peak_slow = 0
+    with _local_server() as base:
+        urls = [f"{base}/slow/{i}" for i in range(12)]
+        htmls = fetch_pages(urls, timeout=10, concurrency=12, limit_per_host=4)
+
+    assert all(f"Page {i}" in htmls[url] for i, url in enumerate(urls))
+    assert 1 < _PageHandler.peak_slow <= 4
+    print(f"  ✓ Fetched {len(urls)} pages, at most {_PageHandler.peak_slow} at once")
+
+
+async def _fetch_pooled(url):
+    """Fetch `url` with the pooled client; returns the HTML and the loop's pooled clients."""
+    html = await fetch_page_async(url, timeout=10)
+    return html, list(html_fetch._async_clients[asyncio.get_running_loop()].values())
+
+
+def test_pooled_clients_closed():
+    """Test pooled clients are closed when their event loop or thread finishes."""
+    print("\nTesting pooled client shutdown...")
+
+    def fetch_in_thread(url, clients):
+        fetch_page(url, timeout=10)
+        clients.extend(html_fetch._local.clients.values())
+
+    with _local_server() as base:
+        html, async_clients = asyncio.run(_fetch_pooled(f"{base}/page/a"))
+        sync_clients = []
+        thread = threading.Thread(target=fetch_in_thread, args=(f"{base}/page/b", sync_clients))
+        thread.start()
+        thread.join()
+        gc.collect()
+
+    assert "Page a" in html
+    assert async_clients and all(client.is_closed for client in async_clients)
+    print("  ✓ Async clients closed with their event loop")
+
+    assert sync_clients and all(client.is_closed for client in sync_clients)
+    print("  ✓ Sync clients closed with their thread")
+
+
+def test_pooled_clients_closed_manual_loop():
+    """Test `aclose_clients` closes and releases a hand-driven loop's clients."""
+    print("\nTesting pooled client shutdown on a manual loop...")
+
+    loop = asyncio.new_event_loop()
+    try:
+        with _local_server() as base:
+            html, clients = loop.run_until_complete(_fetch_pooled(f"{base}/page/a"))
+        loop.run_until_complete(html_fetch.aclose_clients())
+    finally:
+        loop.close()
+
+    assert "Page a" in html
+    assert clients and all(client.is_closed for client in clients)
+    assert loop not in html_fetch._async_clients and loop not in html_fetch._close_tasks
+    print("  ✓ Clients closed and released before the loop closes")
+
+
+def test_audit_report():
+    """Test `audit` reports every listed URL in input order, including repeats and failures."""
+    print("\nTesting audit reports...")
+
+    with tempfile.TemporaryDirectory() as tmp, _local_server() as base:
+        urls = [f"{base}/page/0", f"{base}/page/1", f"{base}/page/0", f"{base}/missing"]
+        input_csv = Path(tmp) / "urls.csv"
+        input_csv.write_text("url\n" + "\n".join(urls) + "\n")
+        reports_dir = Path(tmp) / "reports"
+
+        result = CliRunner().invoke(app, [
+            "--input", str(input_csv),
+            "--no-llm",
+            "--cache-dir", str(Path(tmp) / "cache"),
+            "--reports-dir", str(reports_dir),
+        ])
+        assert result.exit_code == 0, result.output
+
+        jsonl = (reports_dir / "pages.jsonl").read_bytes()
+        pages = [orjson.loads(line) for line in jsonl.splitlines()]
+        summary = (reports_dir / "summary.csv").read_text().splitlines()
+
+    assert [page["url"] for page in pages] == urls
+    assert [row.split(",")[0] for row in summary[1:]] == urls
+    print(f"  ✓ One row per listed URL, in input order ({len(pages)})")
+
+    errors = {page["url"]: page.get("error") for page in pages}
+    assert errors[f"{base}/missing"] == "Failed to fetch page"
+    assert errors[f"{base}/page/0"] is None
+    print("  ✓ Failed fetch reported as an error row")
+
+
 def test_cache_integration():
     """Test cache with real data."""
     print("\nTesting cache integration...")
@@ -111,7 +478,20 @@ if __name__ == "__main__":
     
     try:
         test_cache()
+        test_cache_memory_layer()
+        test_cache_memory_eviction()
+        test_cache_compression()
+        test_parse_html_memoized()
+        test_readability_summary_memoized()
+        test_parsed_page()
+        test_extract_text_html_cap()
+        test_extract_metadata()
         test_fetch_and_extract()
+        test_fetch_and_parse()
+        test_fetch_pages_limit_per_host()
+        test_pooled_clients_closed()
+        test_pooled_clients_closed_manual_loop()
+        test_audit_report()
         test_cache_integration()
         print("\n✅ All integration tests passed!")
     except AssertionError as e:
@@ -3,16 +3,25 @@
 import sys
 import os
 
+import pytest
+
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from rules.seo_rules import check_seo, check_title_tag, check_meta_description, check_h1_tags
-from rules.a11y_rules import check_a11y, check_image_alts, check_link_text
+from rules.a11y_rules import (
+    check_a11y,
+    check_heading_hierarchy,
+    check_image_alts,
+    check_link_text,
+)
+from utils.html_to_text import parse_html
 
 
-def test_seo_rules():
-    """Test SEO rule checks."""
-    html = """
+# Fixtures are built once at import time and shared by the tests below
+_400_WORDS = " ".join(["word"] * 400)
+
+SEO_HTML = f"""
     <html>
     <head>
         <title>This is a good title length for SEO testing</title>
@@ -21,32 +30,12 @@ def test_seo_rules():
     </head>
     <body>
         <h1>Main Heading</h1>
-        <p>""" + " ".join(["word"] * 400) + """</p>
+        <p>{_400_WORDS}</p>
     </body>
     </html>
     """
-    
-    text = " ".join(["word"] * 400)
-    
-    results = check_seo(html, text)
-    
-    assert "overall_score" in results
-    assert results["overall_score"] > 0
-    assert "scores" in results
-    assert "title" in results["scores"]
-    assert "meta_description" in results["scores"]
-    assert "h1" in results["scores"]
-    
-    print(f"✓ SEO checks passed - Overall score: {results['overall_score']:.1f}")
-    print(f"  Title score: {results['scores']['title']}")
-    print(f"  Meta desc score: {results['scores']['meta_description']}")
-    print(f"  H1 score: {results['scores']['h1']}")
-    return results
-
-
-def test_a11y_rules():
-    """Test accessibility rule checks."""
-    html = """
+
+A11Y_HTML = """
     <html>
     <body>
         <h1>Main Title</h1>
@@ -59,41 +48,12 @@ def test_a11y_rules():
     </body>
     </html>
     """
-    
-    text = "Main Title Subtitle Section"
-    
-    results = check_a11y(html, text)
-    
-    assert "overall_score" in results
-    assert results["overall_score"] > 0
-    assert "scores" in results
-    assert "image_alts" in results["scores"]
-    assert "heading_hierarchy" in results["scores"]
-    
-    print(f"✓ A11y checks passed - Overall score: {results['overall_score']:.1f}")
-    print(f"  Image alts score: {results['scores']['image_alts']}")
-    print(f"  Heading hierarchy score: {results['scores']['heading_hierarchy']}")
-    print(f"  Link text score: {results['scores']['link_text']}")
-    return results
-
-
-def test_poor_seo():
-    """Test SEO rules with poor content."""
-    html = "<html><body><p>Short content</p></body></html>"
-    text = "Short content"
-    
-    results = check_seo(html, text)
-    
-    assert len(results["issues"]) > 0
-    print(f"✓ Poor SEO detection passed - Found {len(results['issues'])} issues")
-    for issue in results["issues"]:
-        print(f"  - {issue}")
-    return results
+A11Y_TEXT = "Main Title Subtitle Section"
 
+POOR_SEO_HTML = "<html><body><p>Short content</p></body></html>"
+POOR_SEO_TEXT = "Short content"
 
-def test_poor_a11y():
-    """Test A11y rules with poor content."""
-    html = """
+POOR_A11Y_HTML = """
     <html>
     <body>
         <img src="no-alt.jpg">
@@ -101,35 +61,116 @@ def test_poor_a11y():
     </body>
     </html>
     """
-    text = "click here"
-    
-    results = check_a11y(html, text)
-    
+POOR_A11Y_TEXT = "click here"
+
+SHARED_HTML = """
+    <html>
+    <head><title>Shared parse title for rule checks</title></head>
+    <body>
+        <h1>Main Title</h1>
+        <h3>Skipped level</h3>
+        <img src="image1.jpg">
+        <a href="/page">read more</a>
+    </body>
+    </html>
+    """
+SHARED_TEXT = "Main Title Skipped level read more"
+
+
+@pytest.fixture(scope="module")
+def seo_results():
+    """SEO results for the well-formed page, computed once per module."""
+    return check_seo(SEO_HTML, _400_WORDS)
+
+
+@pytest.fixture(scope="module")
+def a11y_results():
+    """A11y results for the well-formed page, computed once per module."""
+    return check_a11y(A11Y_HTML, A11Y_TEXT)
+
+
+def test_seo_rules(seo_results):
+    """Test SEO rule checks."""
+    assert "overall_score" in seo_results
+    assert seo_results["overall_score"] > 0
+    assert "scores" in seo_results
+    print(f"✓ SEO checks passed - Overall score: {seo_results['overall_score']:.1f}")
+
+
+@pytest.mark.parametrize("check", ["title", "meta_description", "h1"])
+def test_seo_scores(seo_results, check):
+    """Test each SEO check reports a score."""
+    assert check in seo_results["scores"]
+    print(f"  {check} score: {seo_results['scores'][check]}")
+
+
+def test_a11y_rules(a11y_results):
+    """Test accessibility rule checks."""
+    assert "overall_score" in a11y_results
+    assert a11y_results["overall_score"] > 0
+    assert "scores" in a11y_results
+    print(f"✓ A11y checks passed - Overall score: {a11y_results['overall_score']:.1f}")
+
+
+@pytest.mark.parametrize("check", ["image_alts", "heading_hierarchy", "link_text"])
+def test_a11y_scores(a11y_results, check):
+    """Test each A11y check reports a score."""
+    assert check in a11y_results["scores"]
+    print(f"  {check} score: {a11y_results['scores'][check]}")
+
+
+@pytest.mark.parametrize(
+    "check, html, text",
+    [
+        (check_seo, POOR_SEO_HTML, POOR_SEO_TEXT),
+        (check_a11y, POOR_A11Y_HTML, POOR_A11Y_TEXT),
+    ],
+    ids=["seo", "a11y"],
+)
+def test_poor_content(check, html, text):
+    """Test rules report issues for poor content."""
+    results = check(html, text)
+
     assert len(results["issues"]) > 0
-    print(f"✓ Poor A11y detection passed - Found {len(results['issues'])} issues")
+    print(f"✓ Poor content detection passed - Found {len(results['issues'])} issues")
     for issue in results["issues"]:
         print(f"  - {issue}")
-    return results
+
+
+def test_heading_hierarchy_document_order():
+    """Test heading levels are compared in document order."""
+    html = "<html><body><h1>Title</h1><h3>Jump</h3><h2>Back</h2></body></html>"
+
+    result = check_heading_hierarchy(parse_html(html))
+
+    assert result["score"] == 50
+    assert result["issues"] == ["Heading hierarchy skips from H1 to H3"]
+    print("✓ Heading skip detected in document order")
+
+
+@pytest.mark.parametrize("check", [check_seo, check_a11y], ids=["seo", "a11y"])
+def test_shared_soup(check):
+    """Test rule checks give the same results on a pre-parsed tree."""
+    assert check(parse_html(SHARED_HTML), SHARED_TEXT) == check(SHARED_HTML, SHARED_TEXT)
+    print("✓ Shared soup produces identical results")
+
+
+@pytest.mark.parametrize("check", [check_seo, check_a11y], ids=["seo", "a11y"])
+@pytest.mark.parametrize(
+    "html, text",
+    [
+        ("", ""),
+        (POOR_SEO_HTML, POOR_SEO_TEXT),
+        ("<div><span>No relevant tags</span><abbr>here</abbr></div>", "No relevant tags here"),
+    ],
+    ids=["empty", "poor", "untagged"],
+)
+def test_untagged_fast_path(check, html, text):
+    """Test markup without relevant tags scores the same as a full parse."""
+    assert check(html, text) == check(parse_html(html), text)
+    print("✓ Fast path matches the full parse")
 
 
 if __name__ == "__main__":
     print("Running rule-based tests...\n")
-    
-    try:
-        test_seo_rules()
-        print()
-        test_a11y_rules()
-        print()
-        test_poor_seo()
-        print()
-        test_poor_a11y()
-        print()
-        print("\n✅ All tests passed!")
-    except AssertionError as e:
-        print(f"\n❌ Test failed: {e}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"\n❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
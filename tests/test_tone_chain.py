@@ -0,0 +1,174 @@
+"""Tests for tone analysis, its response cache and budget handling."""
+
+import sys
+import os
+
+import orjson
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chains.tone_chain as tone_chain
+from chains.tone_chain import MAX_CACHEABLE_TEMPERATURE, _FENCE_RE, analyze_tone, get_cached_tone
+from main import finish_page
+from utils.budget import BudgetManager
+from utils.cache import Cache
+
+
+REPLY = '{"readability": "Clear", "tone": "Friendly", "risks": "None"}'
+TEXT = "Some page text to analyze."
+
+
+class StubLLM:
+    """Stands in for the Ollama client, returning a fixed reply."""
+
+    def __init__(self, reply=REPLY, error=None):
+        self.reply = reply
+        self.error = error
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.reply
+
+
+@pytest.fixture
+def stub_llm(monkeypatch):
+    """Replace `_get_llm` so no model is called; returns the stub."""
+    llm = StubLLM()
+    monkeypatch.setattr(tone_chain, "_get_llm", lambda *args: llm)
+    return llm
+
+
+@pytest.fixture
+def tone_cache(tmp_path):
+    """Empty tone response cache."""
+    return Cache(str(tmp_path / "tone"))
+
+
+def _checks(text=TEXT):
+    """Minimal `run_rule_checks` output for `finish_page`."""
+    rules = {"issues": [], "overall_score": 100}
+    return {
+        "url": "https://example.com/page",
+        "text": text,
+        "seo_rules": rules,
+        "a11y_rules": rules,
+    }
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        REPLY,
+        f"```\n{REPLY}\n```",
+        f"```json\n{REPLY}\n```",
+        f"```JSON\n{REPLY}\n```",
+        f"```javascript\n{REPLY}\n```",
+        f"  ```json {REPLY} ```  ",
+        f"```{REPLY}```",
+    ],
+    ids=["bare", "plain", "json", "upper", "javascript", "inline", "one-line"],
+)
+def test_fence_stripping(response):
+    """Test markdown fences are stripped whatever the language tag."""
+    stripped = _FENCE_RE.sub("", response).strip()
+
+    assert orjson.loads(stripped) == orjson.loads(REPLY)
+    print("✓ Fenced reply parsed")
+
+
+
+def test_analysis_cached(stub_llm, tone_cache):
+    """Test a successful analysis is stored and found by `get_cached_tone`."""
+    assert get_cached_tone(TEXT, tone_cache) is None
+
+    result = analyze_tone(TEXT, cache=tone_cache)
+
+    assert result == orjson.loads(REPLY)
+    assert get_cached_tone(TEXT, tone_cache) == result
+    assert stub_llm.calls == 1
+    print("✓ Analysis stored in the tone cache")
+
+
+def test_hot_temperature_not_cached(stub_llm, tone_cache):
+    """Test analyses above the temperature cutoff are not stored."""
+    analyze_tone(TEXT, cache=tone_cache, temperature=MAX_CACHEABLE_TEMPERATURE + 0.1)
+
+    assert get_cached_tone(TEXT, tone_cache) is None
+    print("✓ Hot-temperature analysis not cached")
+
+
+@pytest.mark.parametrize(
+    "reply, risks",
+    [
+        (
+            '{"readability": "Clear", "tone": "Friendly"}',
+            "Analysis failed - invalid response format",
+        ),
+        ("not json at all", "Analysis failed - JSON parse error"),
+    ],
+    ids=["missing-key", "not-json"],
+)
+def test_bad_reply(stub_llm, tone_cache, reply, risks):
+    """Test malformed replies return the failure result and are not cached."""
+    stub_llm.reply = reply
+
+    result = analyze_tone(TEXT, cache=tone_cache)
+
+    assert result["risks"] == risks
+    assert get_cached_tone(TEXT, tone_cache) is None
+    print("✓ Malformed reply reported, not cached")
+
+
+def test_finish_page_cache_hit_skips_budget(stub_llm, tone_cache, tmp_path):
+    """Test a cached analysis is reused without calling the model or spending budget."""
+    analyze_tone(TEXT, cache=tone_cache)
+    stub_llm.calls = 0
+    budget = BudgetManager(max_calls=1)
+    cache = Cache(str(tmp_path / "pages"))
+
+    result = finish_page(_checks(), cache, budget, tone_cache=tone_cache)
+
+    assert result["tone_summary"] == orjson.loads(REPLY)
+    assert stub_llm.calls == 0
+    assert budget.calls_made == 0
+    print("✓ Cache hit spends no budget")
+
+
+def test_finish_page_charges_budget(stub_llm, tone_cache, tmp_path):
+    """Test a new analysis is charged once and skipped when the budget is spent."""
+    budget = BudgetManager(max_calls=1)
+    cache = Cache(str(tmp_path / "pages"))
+
+    first = finish_page(_checks(), cache, budget, tone_cache=tone_cache)
+    second = finish_page(_checks("Other text."), cache, budget, tone_cache=tone_cache)
+
+    assert first["tone_summary"] == orjson.loads(REPLY)
+    assert second["tone_summary"] is None
+    assert stub_llm.calls == 1
+    assert budget.calls_made == 1
+    print("✓ Budget charged once, then tone skipped")
+
+
+def test_finish_page_refunds_failed_analysis(stub_llm, tone_cache, tmp_path):
+    """Test a failed analysis is refunded to the budget."""
+    stub_llm.error = RuntimeError("model unavailable")
+    budget = BudgetManager(max_calls=1)
+    cache = Cache(str(tmp_path / "pages"))
+
+    result = finish_page(_checks(), cache, budget, tone_cache=tone_cache)
+
+    assert result["tone_summary"] is None
+    assert stub_llm.calls == 1
+    assert budget.calls_made == 0
+    assert budget.get_stats()["calls_by_type"] == {}
+    print("✓ Failed analysis refunded")
+
+
+if __name__ == "__main__":
+    print("Running tone chain tests...\n")
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
@@ -1,13 +1,22 @@
 """Budget management for LLM API calls."""
 
 import logging
+import threading
+from collections import defaultdict
+from types import MappingProxyType
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
 
 class BudgetManager:
-    """Manages and enforces LLM API call budgets."""
+    """Manages and enforces LLM API call budgets.
+
+    Updates are guarded by a lock so a single manager can be shared by the
+    worker threads processing pages concurrently. Reads of the call count
+    take no lock: rebinding an int attribute is atomic, so a reader sees
+    either the old or the new value.
+    """
 
     def __init__(self, max_calls: int = 200):
         """
@@ -18,7 +27,10 @@ class BudgetManager:
         """
         self.max_calls = max_calls
         self.calls_made = 0
-        self.calls_by_type = {}
+        self.calls_by_type = defaultdict(int)
+        self._calls_by_type_view = MappingProxyType(self.calls_by_type)
+        self._lock = threading.Lock()
+        self._limit_logged = False
         logger.info(f"BudgetManager initialized with max_calls={max_calls}")
 
     def can_make_call(self, call_type: str = "default") -> bool:
@@ -31,13 +43,62 @@ class BudgetManager:
         Returns:
             True if within budget, False otherwise
         """
-        if self.calls_made >= self.max_calls:
-            logger.warning(
-                f"Budget limit reached: {self.calls_made}/{self.max_calls} calls made"
-            )
+        calls_made = self.calls_made
+        if calls_made >= self.max_calls:
+            self._log_limit_reached(calls_made)
             return False
         return True
 
+    def try_consume(self, call_type: str = "default") -> bool:
+        """
+        Reserve one LLM call if the budget allows it.
+
+        Checking and recording happen in one step, so concurrent callers can
+        never take the count past `max_calls`. Use `refund` if the reserved
+        call ends up not being made or fails.
+
+        Args:
+            call_type: Type of call (e.g., 'tone_analysis', 'readability')
+
+        Returns:
+            True if the call was reserved, False if the budget is exhausted
+        """
+        with self._lock:
+            calls_made = self.calls_made
+            if calls_made < self.max_calls:
+                self.calls_made = calls_made + 1
+                self.calls_by_type[call_type] += 1
+                return True
+        self._log_limit_reached(calls_made)
+        return False
+
+    def _log_limit_reached(self, calls_made: int):
+        """
+        Warn that the budget is exhausted, once until the next `reset`.
+
+        Args:
+            calls_made: Call count observed when the limit was hit
+        """
+        if not self._limit_logged:
+            self._limit_logged = True
+            logger.warning(
+                f"Budget limit reached: {calls_made}/{self.max_calls} calls made"
+            )
+
+    def refund(self, call_type: str = "default"):
+        """
+        Return a call reserved with `try_consume` that was not used.
+
+        Args:
+            call_type: Type the call was reserved under
+        """
+        with self._lock:
+            self.calls_made -= 1
+            self.calls_by_type[call_type] -= 1
+            if not self.calls_by_type[call_type]:
+                del self.calls_by_type[call_type]
+        logger.debug(f"Call refunded: type={call_type}")
+
     def record_call(self, call_type: str = "default", tokens_used: Optional[int] = None):
         """
         Record an LLM call.
@@ -46,33 +107,47 @@ class BudgetManager:
             call_type: Type of call (e.g., 'tone_analysis', 'readability')
             tokens_used: Number of tokens used (optional, for tracking)
         """
-        self.calls_made += 1
-        self.calls_by_type[call_type] = self.calls_by_type.get(call_type, 0) + 1
+        with self._lock:
+            self.calls_made += 1
+            self.calls_by_type[call_type] += 1
+            calls_made = self.calls_made
         logger.debug(
-            f"Call recorded: type={call_type}, total={self.calls_made}/{self.max_calls}"
+            f"Call recorded: type={call_type}, total={calls_made}/{self.max_calls}"
         )
         if tokens_used:
             logger.debug(f"Tokens used: {tokens_used}")
 
-    def get_stats(self) -> dict:
+    def get_stats(self, deep: bool = False) -> dict:
         """
         Get budget statistics.
 
+        Args:
+            deep: Return `calls_by_type` as a consistent snapshot copy
+                instead of a read-only live view of the counters
+
         Returns:
             Dictionary with budget usage stats
         """
+        if deep:
+            with self._lock:
+                calls_made = self.calls_made
+                calls_by_type = dict(self.calls_by_type)
+        else:
+            calls_made = self.calls_made
+            calls_by_type = self._calls_by_type_view
+        max_calls = self.max_calls
         return {
-            "total_calls": self.calls_made,
-            "max_calls": self.max_calls,
-            "remaining_calls": max(0, self.max_calls - self.calls_made),
-            "budget_used_percent": (self.calls_made / self.max_calls * 100)
-            if self.max_calls > 0
-            else 0,
-            "calls_by_type": self.calls_by_type.copy(),
+            "total_calls": calls_made,
+            "max_calls": max_calls,
+            "remaining_calls": max(0, max_calls - calls_made),
+            "budget_used_percent": calls_made / max_calls * 100 if max_calls > 0 else 0,
+            "calls_by_type": calls_by_type,
         }
 
     def reset(self):
         """Reset budget counters."""
-        self.calls_made = 0
-        self.calls_by_type = {}
+        with self._lock:
+            self.calls_made = 0
+            self.calls_by_type.clear()
+            self._limit_logged = False
         logger.info("Budget counters reset")
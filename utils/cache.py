@@ -1,31 +1,66 @@
 """Disk-based caching for page analysis results."""
 
 import hashlib
-import json
 import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Optional
 
+import orjson
+import zstandard
+
+# Leading bytes of every zstd frame; rows without them are uncompressed JSON
+# written before compression was added
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
 logger = logging.getLogger(__name__)
 
 
 class Cache:
-    """Simple disk-based cache using JSON files."""
-
-    def __init__(self, cache_dir: str = ".cache"):
+    """Simple disk-based cache backed by a single SQLite database.
+
+    Entries are stored as zstd-compressed JSON blobs in `cache.db` inside the
+    cache directory (WAL mode, autocommit). With synchronous=NORMAL a write is
+    not fsynced on its own; the WAL is synced at checkpoints. Recently used
+    entries are also kept in a bounded in-memory LRU so hot keys skip the
+    query and JSON decode.
+    Access is serialized with a lock so one instance can be shared across
+    worker threads.
+    """
+
+    def __init__(self, cache_dir: str = ".cache", max_entries: int = 1024):
         """
         Initialize cache.
 
         Args:
             cache_dir: Directory for cache storage
+            max_entries: Maximum number of entries kept in memory
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / "cache.db"
+        self._conn = sqlite3.connect(
+            self.db_path, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Safe under WAL: a crash can lose the latest writes, never corrupt the db
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (k TEXT PRIMARY KEY, v BLOB, ts INTEGER)"
+        )
+        self._compressor = zstandard.ZstdCompressor(level=3)
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._mem: OrderedDict[str, dict] = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.RLock()
         logger.info(f"Cache initialized at {self.cache_dir}")
 
     def _get_hash(self, key: str) -> str:
         """
-        Generate SHA256 hash of key.
+        Generate a 128-bit BLAKE2b hash of key.
 
         Args:
             key: String to hash (typically URL)
@@ -33,20 +68,20 @@ class Cache:
         Returns:
             Hex digest of hash
         """
-        return hashlib.sha256(key.encode()).hexdigest()
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
 
-    def _get_cache_path(self, key: str) -> Path:
+    def _remember(self, key: str, data: dict):
         """
-        Get cache file path for a key.
+        Insert data into the in-memory LRU, evicting the oldest entry if full.
 
         Args:
             key: Cache key
-
-        Returns:
-            Path to cache file
+            data: Data dictionary to keep in memory
         """
-        key_hash = self._get_hash(key)
-        return self.cache_dir / f"{key_hash}.json"
+        self._mem[key] = data
+        self._mem.move_to_end(key)
+        if len(self._mem) > self._max_entries:
+            self._mem.popitem(last=False)
 
     def get(self, key: str) -> Optional[dict]:
         """
@@ -58,13 +93,25 @@ class Cache:
         Returns:
             Cached data dictionary or None if not found
         """
-        cache_path = self._get_cache_path(key)
-        if cache_path.exists():
-            try:
-                with open(cache_path, "r") as f:
-                    data = json.load(f)
-                logger.debug(f"Cache hit for key: {key[:50]}...")
+        with self._lock:
+            data = self._mem.get(key)
+            if data is not None:
+                self._mem.move_to_end(key)
+                logger.debug(f"Cache hit (memory) for key: {key[:50]}...")
                 return data
+
+            try:
+                row = self._conn.execute(
+                    "SELECT v FROM cache WHERE k = ?", (self._get_hash(key),)
+                ).fetchone()
+                if row is not None:
+                    blob = row[0]
+                    if blob[:4] == _ZSTD_MAGIC:
+                        blob = self._decompressor.decompress(blob)
+                    data = orjson.loads(blob)
+                    self._remember(key, data)
+                    logger.debug(f"Cache hit for key: {key[:50]}...")
+                    return data
             except Exception as e:
                 logger.error(f"Error reading cache for {key}: {e}")
                 return None
@@ -79,21 +126,30 @@ class Cache:
             key: Cache key (typically URL)
             data: Data dictionary to cache
         """
-        cache_path = self._get_cache_path(key)
-        try:
-            with open(cache_path, "w") as f:
-                json.dump(data, f, indent=2)
-            logger.debug(f"Cached data for key: {key[:50]}...")
-        except Exception as e:
-            logger.error(f"Error writing cache for {key}: {e}")
+        with self._lock:
+            self._remember(key, data)
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (k, v, ts) VALUES (?, ?, ?)",
+                    (
+                        self._get_hash(key),
+                        self._compressor.compress(orjson.dumps(data)),
+                        int(time.time()),
+                    ),
+                )
+                logger.debug(f"Cached data for key: {key[:50]}...")
+            except Exception as e:
+                logger.error(f"Error writing cache for {key}: {e}")
 
     def clear(self):
-        """Clear all cached data."""
-        count = 0
-        for cache_file in self.cache_dir.glob("*.json"):
-            cache_file.unlink()
-            count += 1
-        logger.info(f"Cleared {count} cached files")
+        """Clear all cached data, including per-entry `*.json` files left by older versions."""
+        with self._lock:
+            self._mem.clear()
+            count = self._conn.execute("DELETE FROM cache").rowcount
+            for cache_file in self.cache_dir.glob("*.json"):
+                cache_file.unlink()
+                count += 1
+        logger.info(f"Cleared {count} cached entries")
 
     def get_stats(self) -> dict:
         """
@@ -102,10 +158,12 @@ class Cache:
         Returns:
             Dictionary with cache stats
         """
-        cache_files = list(self.cache_dir.glob("*.json"))
-        total_size = sum(f.stat().st_size for f in cache_files)
+        with self._lock:
+            total_entries, total_size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length(v)), 0) FROM cache"
+            ).fetchone()
         return {
-            "total_entries": len(cache_files),
+            "total_entries": total_entries,
             "total_size_bytes": total_size,
             "total_size_mb": round(total_size / (1024 * 1024), 2),
         }
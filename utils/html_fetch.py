@@ -1,30 +1,199 @@
 """HTML fetching utilities using httpx."""
 
+import asyncio
+import functools
+import itertools
 import logging
-from typing import Optional
+import threading
+import weakref
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
 
 import httpx
+from lxml import html as lhtml
 
 logger = logging.getLogger(__name__)
 
+# Sync clients are per thread (httpx.Client is not shared across the audit's
+# worker threads) and are closed when their thread exits, or at interpreter exit.
+_local = threading.local()
 
-async def fetch_page_async(url: str, timeout: int = 30) -> Optional[str]:
+# Async clients are bound to the event loop they were first used on, so they
+# are cached per loop. A task per loop closes them when it is cancelled, which
+# `asyncio.run` and `asyncio.Runner` do on exit; loops driven any other way
+# must await `aclose_clients()` before closing, or both entries stay here.
+_async_clients: Dict[asyncio.AbstractEventLoop, Dict[int, httpx.AsyncClient]] = {}
+_close_tasks: Dict[asyncio.AbstractEventLoop, "asyncio.Task[None]"] = {}
+
+# Streamed pages are parsed on long-lived single-worker executors, so each
+# parser stays on one thread while the threads themselves are reused across
+# fetches. They are handed out round-robin.
+_PARSE_THREADS = 4
+_parse_executors = [
+    ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"parse-{i}")
+    for i in range(_PARSE_THREADS)
+]
+_next_parse_executor = itertools.cycle(_parse_executors).__next__
+
+
+class _ThreadClients(dict):
+    """A thread's sync clients by timeout (a dict subclass, so it can be weakly referenced)."""
+
+
+def _get_client(timeout: int) -> httpx.Client:
+    """
+    Get this thread's pooled sync client for the given timeout.
+
+    Args:
+        timeout: Request timeout in seconds
+
+    Returns:
+        Client reused by later calls from the same thread
+    """
+    clients = getattr(_local, "clients", None)
+    if clients is None:
+        clients = _local.clients = _ThreadClients()
+    client = clients.get(timeout)
+    if client is None:
+        client = httpx.Client(timeout=timeout, follow_redirects=True, http2=True)
+        clients[timeout] = client
+        # Runs when the thread's locals are released, or at exit otherwise
+        weakref.finalize(clients, client.close)
+    return client
+
+
+def _get_async_client(timeout: int) -> httpx.AsyncClient:
+    """
+    Get the running event loop's pooled async client for the given timeout.
+
+    The client is closed when the loop's `asyncio.run` (or `asyncio.Runner`)
+    finishes, or by `aclose_clients()`.
+
+    Args:
+        timeout: Request timeout in seconds
+
+    Returns:
+        Client reused by later calls on the same event loop
+    """
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.get(loop)
+    if clients is None:
+        clients = _async_clients[loop] = {}
+        _close_tasks[loop] = loop.create_task(_close_on_shutdown(loop))
+    client = clients.get(timeout)
+    if client is None:
+        client = httpx.AsyncClient(timeout=timeout, follow_redirects=True, http2=True)
+        clients[timeout] = client
+    return client
+
+
+async def _close_on_shutdown(loop: asyncio.AbstractEventLoop) -> None:
+    """
+    Wait until cancelled, then close the loop's pooled async clients.
+
+    `asyncio.run` and `asyncio.Runner` cancel tasks still pending when they
+    finish, which is what ends the wait; `aclose_clients()` cancels it early.
+
+    Args:
+        loop: Event loop whose clients are closed
+    """
+    try:
+        await loop.create_future()
+    finally:
+        _close_tasks.pop(loop, None)
+        for client in _async_clients.pop(loop, {}).values():
+            await client.aclose()
+
+
+async def aclose_clients() -> None:
+    """
+    Close the running event loop's pooled async clients.
+
+    Only needed for loops not run by `asyncio.run` or `asyncio.Runner`, such
+    as one driven with `run_until_complete`: await this before closing the
+    loop, or its clients stay open and referenced.
+    """
+    task = _close_tasks.get(asyncio.get_running_loop())
+    if task is not None:
+        task.cancel()
+        await asyncio.wait([task])
+
+
+async def fetch_page_async(
+    url: str,
+    timeout: int = 30,
+    client: Optional[httpx.AsyncClient] = None
+) -> Optional[str]:
     """
     Asynchronously fetch HTML content from URL.
 
     Args:
         url: URL to fetch
         timeout: Request timeout in seconds
+        client: Shared client to reuse pooled connections (the event loop's
+            pooled client is used if omitted)
 
     Returns:
         HTML content as string, or None on error
     """
     try:
-        async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-            response = await client.get(url)
+        if client is None:
+            client = _get_async_client(timeout)
+        response = await client.get(url)
+        response.raise_for_status()
+        logger.debug(f"Fetched {url} - Status: {response.status_code}")
+        return response.text
+    except httpx.HTTPStatusError as e:
+        logger.error(f"HTTP error fetching {url}: {e.response.status_code}")
+        return None
+    except httpx.RequestError as e:
+        logger.error(f"Request error fetching {url}: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"Unexpected error fetching {url}: {e}")
+        return None
+
+
+async def fetch_and_parse(
+    url: str,
+    timeout: int = 30,
+    client: Optional[httpx.AsyncClient] = None
+) -> Optional[lhtml.HtmlElement]:
+    """
+    Asynchronously fetch a page and parse it while the body streams in.
+
+    The raw response bytes are fed to an incremental lxml parser in 64 KiB
+    chunks, so parsing overlaps the download and no decoded `str` copy of
+    the body is ever built. Parsing runs on one of a few shared worker
+    threads, keeping the event loop free for other fetches; the parser is
+    created and fed on that one thread, as lxml requires.
+
+    Args:
+        url: URL to fetch
+        timeout: Request timeout in seconds
+        client: Shared client to reuse pooled connections (the event loop's
+            pooled client is used if omitted)
+
+    Returns:
+        Root element of the parsed document, or None on error
+    """
+    try:
+        if client is None:
+            client = _get_async_client(timeout)
+        loop = asyncio.get_running_loop()
+        parse_thread = _next_parse_executor()
+        async with client.stream('GET', url) as response:
             response.raise_for_status()
+            parser = await loop.run_in_executor(
+                parse_thread,
+                functools.partial(lhtml.HTMLParser, encoding=response.charset_encoding),
+            )
+            async for chunk in response.aiter_bytes(65536):
+                await loop.run_in_executor(parse_thread, parser.feed, chunk)
             logger.debug(f"Fetched {url} - Status: {response.status_code}")
-            return response.text
+            return await loop.run_in_executor(parse_thread, parser.close)
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error fetching {url}: {e.response.status_code}")
         return None
@@ -36,10 +205,91 @@ async def fetch_page_async(url: str, timeout: int = 30) -> Optional[str]:
         return None
 
 
+async def fetch_pages_async(
+    urls: List[str],
+    timeout: int = 30,
+    concurrency: int = 16,
+    limit_per_host: int = 4
+) -> List[Optional[str]]:
+    """
+    Asynchronously fetch many URLs over a single shared client.
+
+    At most `concurrency` requests are in flight at once, and at most
+    `limit_per_host` of them to any one host, so an audit of a single site
+    does not hit it with the whole batch at once. The client
+    negotiates HTTP/2 where the server supports it, so requests to the same
+    host can share one connection. A failure is logged and returned as None
+    for that URL instead of aborting the batch.
+
+    Args:
+        urls: URLs to fetch
+        timeout: Request timeout in seconds
+        concurrency: Maximum number of concurrent requests
+        limit_per_host: Maximum number of concurrent requests per host
+
+    Returns:
+        HTML content (or None on error) for each URL, in input order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    host_semaphores: Dict[str, asyncio.Semaphore] = defaultdict(
+        lambda: asyncio.Semaphore(limit_per_host)
+    )
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(
+        timeout=timeout, follow_redirects=True, limits=limits, http2=True
+    ) as client:
+
+        async def fetch_one(url: str) -> Optional[str]:
+            # Wait for the host's slot first, so a busy host does not hold
+            # global slots that requests to other hosts could use
+            async with host_semaphores[urlsplit(url).netloc], semaphore:
+                return await fetch_page_async(url, timeout=timeout, client=client)
+
+        results = await asyncio.gather(
+            *(fetch_one(url) for url in urls), return_exceptions=True
+        )
+
+    htmls: List[Optional[str]] = []
+    for url, result in zip(urls, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Unexpected error fetching {url}: {result}")
+            result = None
+        htmls.append(result)
+    return htmls
+
+
+def fetch_pages(
+    urls: List[str],
+    timeout: int = 30,
+    concurrency: int = 16,
+    limit_per_host: int = 4
+) -> Dict[str, Optional[str]]:
+    """
+    Fetch many URLs concurrently from synchronous code.
+
+    Args:
+        urls: URLs to fetch
+        timeout: Request timeout in seconds
+        concurrency: Maximum number of concurrent requests
+        limit_per_host: Maximum number of concurrent requests per host
+
+    Returns:
+        Mapping of URL to HTML content (None for pages that failed)
+    """
+    htmls = asyncio.run(fetch_pages_async(
+        urls, timeout=timeout, concurrency=concurrency, limit_per_host=limit_per_host
+    ))
+    return dict(zip(urls, htmls))
+
+
 def fetch_page(url: str, timeout: int = 30) -> Optional[str]:
     """
     Synchronously fetch HTML content from URL.
 
+    Requests reuse a pooled client per thread, so repeated fetches keep their
+    connections alive instead of reconnecting each time.
+
     Args:
         url: URL to fetch
         timeout: Request timeout in seconds
@@ -48,11 +298,10 @@ def fetch_page(url: str, timeout: int = 30) -> Optional[str]:
         HTML content as string, or None on error
     """
     try:
-        with httpx.Client(timeout=timeout, follow_redirects=True) as client:
-            response = client.get(url)
-            response.raise_for_status()
-            logger.debug(f"Fetched {url} - Status: {response.status_code}")
-            return response.text
+        response = _get_client(timeout).get(url)
+        response.raise_for_status()
+        logger.debug(f"Fetched {url} - Status: {response.status_code}")
+        return response.text
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error fetching {url}: {e.response.status_code}")
         return None
@@ -1,64 +1,327 @@
-"""HTML to text extraction using readability-lxml and BeautifulSoup."""
+"""HTML to text extraction using readability-lxml, BeautifulSoup and lxml."""
 
+import functools
+import hashlib
 import logging
 import re
-from typing import Optional
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple, TypeVar, Union
 
 from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lhtml
 from readability import Document
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
 
-def extract_text(html: str, max_length: int = 50000) -> Optional[str]:
+# Default cap on the HTML handed to readability; text past this point is
+# well beyond what `extract_text` returns anyway
+MAX_HTML_BYTES = 2_000_000
+
+# Compiled once; evaluated against lxml trees in `extract_metadata`
+_XP_TITLE = etree.XPath('//title')
+_XP_META = etree.XPath("//meta[@name='description']/@content")
+_XP_CANON = etree.XPath(
+    "//link[contains(concat(' ', normalize-space(@rel), ' '), ' canonical ')]/@href"
+)
+_XP_H = etree.XPath(
+    '//*[self::h1 or self::h2 or self::h3 or self::h4 or self::h5 or self::h6]'
+)
+HEAD_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+# lxml refuses str input that carries an XML encoding declaration (XHTML)
+_XML_DECL_RE = re.compile(r'^\s*<\?xml[^>]*>')
+
+
+def _memoize_by_content(maxsize: int) -> Callable[[Callable[[str], T]], Callable[[str], T]]:
     """
-    Extract clean text content from HTML.
+    Memoize a function of an HTML string in a small thread-safe LRU.
+
+    Entries are keyed by a BLAKE2b digest of the markup, so the cache holds
+    only the results and never pins the (possibly multi-MB) input strings.
+
+    Args:
+        maxsize: Maximum number of results to keep
+
+    Returns:
+        Decorator for a single-argument function taking the HTML
+    """
+    def decorator(func: Callable[[str], T]) -> Callable[[str], T]:
+        results: OrderedDict[bytes, T] = OrderedDict()
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(html: str) -> T:
+            key = hashlib.blake2b(html.encode(), digest_size=16).digest()
+            with lock:
+                if key in results:
+                    results.move_to_end(key)
+                    return results[key]
+            value = func(html)
+            with lock:
+                results[key] = value
+                if len(results) > maxsize:
+                    results.popitem(last=False)
+            return value
+
+        wrapper.cache_clear = results.clear
+        return wrapper
+
+    return decorator
+
+
+@_memoize_by_content(maxsize=2)
+def parse_html(html: str) -> BeautifulSoup:
+    """
+    Parse raw HTML into a BeautifulSoup tree.
+
+    Parse a page once with this and pass the soup to the rule checks instead
+    of letting each of them re-parse the markup. The last couple of trees
+    are memoized by content (full trees are large, so only back-to-back
+    calls on the same markup are served), and parsing the same markup again
+    returns the same shared tree; callers must not modify it.
 
     Args:
         html: Raw HTML string
-        max_length: Maximum text length to return
 
     Returns:
-        Cleaned text content or None on error
+        Parsed BeautifulSoup tree (lxml backend)
+    """
+    return BeautifulSoup(html, 'lxml')
+
+
+# Shared tree returned by `soup_for` for markup that needs no parse
+_EMPTY_SOUP = BeautifulSoup("", "lxml")
+
+
+def soup_for(html: Union[str, BeautifulSoup], tag_re: re.Pattern) -> BeautifulSoup:
     """
+    Get the tree a rule module should check.
+
+    A soup from `parse_html` is returned as-is, so a page parsed once can be
+    shared by every rule module. Raw markup is parsed only if `tag_re` finds
+    one of the tags the module looks at; markup without any of them scores
+    the same as an empty document, so a shared empty tree is returned
+    instead. Callers must not modify the returned tree.
+
+    Args:
+        html: Raw HTML string or a tree from `parse_html`
+        tag_re: Pattern matching the opening tags the caller's checks read
+
+    Returns:
+        Parsed BeautifulSoup tree
+    """
+    if isinstance(html, BeautifulSoup):
+        return html
+    if tag_re.search(html):
+        return parse_html(html)
+    return _EMPTY_SOUP
+
+
+def _parse_tree(html: str) -> lhtml.HtmlElement:
+    """
+    Parse raw HTML into an lxml document tree.
+
+    A leading XML declaration is dropped first; the markup is already
+    decoded, so its encoding attribute no longer applies.
+
+    Args:
+        html: Raw HTML string
+
+    Returns:
+        Root element of the parsed document
+    """
+    return lhtml.document_fromstring(_XML_DECL_RE.sub('', html, count=1))
+
+
+@_memoize_by_content(maxsize=64)
+def _readability_summary(html: str) -> str:
+    """
+    Run readability's main-content extraction (memoized by content).
+
+    Scoring every block of the document is the most expensive step of text
+    extraction, so repeat extractions of the same markup reuse the summary.
+
+    Args:
+        html: Raw HTML string
+
+    Returns:
+        HTML of the main-content summary
+    """
+    return Document(html).summary()
+
+
+def _strip_text(element: lhtml.HtmlElement) -> str:
+    """Join an element's text pieces, each stripped (like `get_text(strip=True)`)."""
+    return ''.join(piece.strip() for piece in element.itertext())
+
+
+def _truncate_html(html: str, max_html_bytes: int) -> str:
+    """
+    Cut oversized HTML at the last `</p>` or `</div>` within the limit.
+
+    Args:
+        html: Raw HTML string
+        max_html_bytes: Maximum length of HTML to keep
+
+    Returns:
+        The HTML unchanged if within the limit, otherwise a prefix of it
+        ending on a paragraph/div boundary (or at the limit if there is none)
+    """
+    if len(html) <= max_html_bytes:
+        return html
+    head = html[:max_html_bytes]
+    cut = max(
+        (head.rfind(tag) + len(tag) for tag in ('</p>', '</div>') if tag in head),
+        default=max_html_bytes,
+    )
+    logger.warning(f"HTML truncated from {len(html)} to {cut} characters before text extraction")
+    return html[:cut]
+
+
+def _extract_main_content(
+    html: str,
+    max_html_bytes: int = MAX_HTML_BYTES
+) -> Tuple[Optional[lhtml.HtmlElement], Optional[str]]:
+    """
+    Extract the main article content from HTML.
+
+    Args:
+        html: Raw HTML string
+        max_html_bytes: Maximum length of HTML parsed; longer input is
+            truncated first
+
+    Returns:
+        Tuple of (tree of readability's main-content summary, cleaned and
+        untruncated text), or (None, None) on error
+    """
+    html = _truncate_html(html, max_html_bytes)
     try:
         # Use readability to extract main content
-        doc = Document(html)
-        content_html = doc.summary()
-        
-        # Parse with BeautifulSoup for text extraction
-        soup = BeautifulSoup(content_html, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
+        content_html = _readability_summary(html)
         
-        # Get text
-        text = soup.get_text(separator=' ', strip=True)
+        # Parse the summary with lxml
+        tree = lhtml.fromstring(content_html)
         
-        # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
+        # Remove script and style elements (keeping the text that follows them)
+        etree.strip_elements(tree, 'script', 'style', with_tail=False)
         
-        # Truncate if needed
-        if len(text) > max_length:
-            text = text[:max_length]
-            logger.debug(f"Text truncated to {max_length} characters")
+        # Get text; pieces are space-separated so adjacent blocks don't run
+        # together, then whitespace runs are collapsed (str.split() also
+        # drops leading/trailing)
+        text = ' '.join(' '.join(tree.itertext()).split())
         
-        logger.debug(f"Extracted {len(text)} characters of text")
-        return text
+        return tree, text
         
     except Exception as e:
         logger.error(f"Error extracting text from HTML: {e}")
+        return None, None
+
+
+class ParsedPage:
+    """A page parsed once and shared by `extract_text` and `extract_metadata`."""
+
+    def __init__(
+        self,
+        soup_full: BeautifulSoup,
+        tree_main: Optional[lhtml.HtmlElement],
+        text: Optional[str],
+        html: Optional[str] = None,
+        tree_full: Optional[lhtml.HtmlElement] = None
+    ):
+        """
+        Initialize parsed page.
+
+        Args:
+            soup_full: BeautifulSoup tree of the whole document
+            tree_main: lxml tree of readability's main-content summary, or
+                None if extraction failed
+            text: Cleaned, untruncated main-content text, or None if
+                extraction failed
+            html: Raw HTML the trees were built from, if available
+            tree_full: lxml tree of the whole document; parsed on first use
+                of `tree_full` if omitted
+        """
+        self.soup_full = soup_full
+        self.tree_main = tree_main
+        self.text = text
+        self.html = html
+        self._tree_full = tree_full
+
+    @property
+    def tree_full(self) -> lhtml.HtmlElement:
+        """lxml tree of the whole document (used by `extract_metadata`)."""
+        if self._tree_full is None:
+            html = self.html if self.html is not None else str(self.soup_full)
+            self._tree_full = _parse_tree(html)
+        return self._tree_full
+
+    @classmethod
+    def from_html(cls, html: str, max_html_bytes: int = MAX_HTML_BYTES) -> "ParsedPage":
+        """
+        Parse raw HTML once for metadata and once for the main content.
+
+        Args:
+            html: Raw HTML string
+            max_html_bytes: Maximum length of HTML parsed for the main
+                content (the full-document tree always sees all of it)
+
+        Returns:
+            ParsedPage for the document
+        """
+        tree_main, text = _extract_main_content(html, max_html_bytes)
+        # Built directly rather than through the `parse_html` cache: the page
+        # keeps its own tree, and a cached copy would only pin more memory
+        return cls(BeautifulSoup(html, 'lxml'), tree_main, text, html=html)
+
+
+def extract_text(
+    html: Union[str, ParsedPage],
+    max_length: int = 50000,
+    max_html_bytes: int = MAX_HTML_BYTES
+) -> Optional[str]:
+    """
+    Extract clean text content from HTML.
+
+    Args:
+        html: Raw HTML string or a `ParsedPage`
+        max_length: Maximum text length to return
+        max_html_bytes: Maximum length of raw HTML parsed; longer input is
+            cut at a paragraph/div boundary first (ignored for a
+            `ParsedPage`, which is already parsed)
+
+    Returns:
+        Cleaned text content or None on error
+    """
+    if isinstance(html, ParsedPage):
+        text = html.text
+    else:
+        _, text = _extract_main_content(html, max_html_bytes)
+    if text is None:
         return None
+    
+    # Truncate if needed
+    if len(text) > max_length:
+        text = text[:max_length]
+        logger.debug(f"Text truncated to {max_length} characters")
+    
+    logger.debug(f"Extracted {len(text)} characters of text")
+    return text
 
 
-def extract_metadata(html: str) -> dict:
+def extract_metadata(html: Union[str, ParsedPage]) -> dict:
     """
     Extract metadata from HTML (title, meta tags, etc.).
 
+    The lookups run as precompiled XPath queries over an lxml tree. All six
+    heading levels are counted, and H1 text collected, in a single pass.
+
     Args:
-        html: Raw HTML string
+        html: Raw HTML string or a `ParsedPage` (its lxml document tree is
+            reused across calls)
 
     Returns:
         Dictionary with metadata fields
@@ -68,35 +331,40 @@ def extract_metadata(html: str) -> dict:
         "meta_description": None,
         "canonical_url": None,
         "h1_tags": [],
-        "headings_count": {"h1": 0, "h2": 0, "h3": 0, "h4": 0, "h5": 0, "h6": 0},
+        "headings_count": dict.fromkeys(HEAD_TAGS, 0),
     }
     
     try:
-        soup = BeautifulSoup(html, 'html.parser')
+        if isinstance(html, ParsedPage):
+            tree = html.tree_full
+        elif not html.strip():
+            return metadata
+        else:
+            tree = _parse_tree(html)
         
         # Extract title
-        title_tag = soup.find('title')
-        if title_tag:
-            metadata["title"] = title_tag.get_text(strip=True)
+        titles = _XP_TITLE(tree)
+        if titles:
+            metadata["title"] = _strip_text(titles[0])
         
         # Extract meta description
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc and meta_desc.get('content'):
-            metadata["meta_description"] = meta_desc['content']
+        meta_desc = _XP_META(tree)
+        if meta_desc and meta_desc[0]:
+            metadata["meta_description"] = meta_desc[0]
         
         # Extract canonical URL
-        canonical = soup.find('link', attrs={'rel': 'canonical'})
-        if canonical and canonical.get('href'):
-            metadata["canonical_url"] = canonical['href']
-        
-        # Extract H1 tags
-        h1_tags = soup.find_all('h1')
-        metadata["h1_tags"] = [h1.get_text(strip=True) for h1 in h1_tags]
+        canonical = _XP_CANON(tree)
+        if canonical and canonical[0]:
+            metadata["canonical_url"] = canonical[0]
         
-        # Count all headings
-        for level in range(1, 7):
-            headings = soup.find_all(f'h{level}')
-            metadata["headings_count"][f"h{level}"] = len(headings)
+        # Count all headings, collecting H1 text in the same pass
+        counts = metadata["headings_count"]
+        h1_tags = metadata["h1_tags"]
+        for heading in _XP_H(tree):
+            tag = heading.tag
+            counts[tag] += 1
+            if tag == 'h1':
+                h1_tags.append(_strip_text(heading))
         
         logger.debug(f"Extracted metadata: title={metadata['title'][:50] if metadata['title'] else 'None'}")
         